@@ -1,5 +1,8 @@
 import logging
+import os
+import stat
 from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlsplit
 
@@ -12,12 +15,14 @@ from fastapi.responses import (
     Response,
 )
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .access import ACCESS_GRANT_LIFETIME, AccessService, InvalidAccessCode
 from .analytics import AnalyticsRecorder, build_analytics_event
 from . import __version__
 from .api_models import HealthResponse, VersionResponse
+from .asset_cache import SmallAssetCache
 from .auth_service import DEV_SESSION_ID, AuthService, Identity
 from .cookies import access_cookie_name, session_cookie_name, set_access_cookie
 from .custom_domains import (
@@ -42,8 +47,8 @@ from .site_store import SiteStore
 from .site_path import (
     InvalidPath,
     InvalidSubdomain,
+    ResolutionCache,
     normalized_url_path,
-    resolve_normalized_site_file,
 )
 from .templating import STATIC_DIR, templates
 from .utils import extract_subdomain, is_control_host
@@ -55,6 +60,13 @@ logger = logging.getLogger(__name__)
 # or changes an endpoint an older CLI depends on.
 MIN_CLI_VERSION = "0.12.0"
 
+# Serialized once at import: both payloads are process constants, and load
+# balancers poll /health far too often to re-serialize a fixed body per probe.
+_HEALTH_BODY = b'{"status":"ok"}'
+_VERSION_BODY = (
+    '{"version":"%s","min_cli_version":"%s"}' % (__version__, MIN_CLI_VERSION)
+).encode()
+
 CONTENT_TYPES = {
     ".html": "text/html",
     ".css": "text/css",
@@ -154,6 +166,7 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         app.state.access.load_visibility()
+        app.state.auth_service.purge_expired()
         await custom_domains.start()
         analytics_started = False
         try:
@@ -168,6 +181,8 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
                     logger.exception("Analytics shutdown failed")
             await custom_domains.stop()
             app.state.access.close()
+            app.state.auth_service.close()
+            github_client.close()
 
     app = FastAPI(
         title="Buzz",
@@ -206,6 +221,7 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
         db=database.connect,
         allow_registration=settings.allow_registration,
         allowed_github_users=settings.allowed_github_users,
+        reader=database.reader(),
     )
     if settings.dev_mode:
         with database.connect() as conn:
@@ -244,6 +260,8 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
     )
     app.state.analytics = AnalyticsRecorder(database.connect)
     app.state.custom_domains = custom_domains
+    app.state.asset_cache = SmallAssetCache()
+    app.state.resolution_cache = ResolutionCache()
 
     @app.exception_handler(BadRequest)
     async def bad_request_handler(request: Request, exc: BadRequest):
@@ -385,7 +403,7 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
         tags=["System"],
     )
     async def health():
-        return {"status": "ok"}
+        return Response(content=_HEALTH_BODY, media_type="application/json")
 
     @app.get(
         "/version",
@@ -401,7 +419,7 @@ def create_app(settings: Settings | None = None, database: Database | None = Non
         tags=["System"],
     )
     async def version():
-        return {"version": __version__, "min_cli_version": MIN_CLI_VERSION}
+        return Response(content=_VERSION_BODY, media_type="application/json")
 
     @app.get("/", response_class=HTMLResponse, include_in_schema=False)
     async def landing(request: Request, identity: Identity | None = Depends(get_identity)):
@@ -567,34 +585,140 @@ async def serve_static(
     settings: Settings,
     private: bool,
 ) -> Response:
+    # The resolver, variant negotiation, and cold-cache reads all make blocking
+    # filesystem calls; on a slow disk those would stall every coroutine, so
+    # the whole probe-and-build step runs on the thread pool. Analytics stays
+    # on the event loop — the recorder's queue belongs to it.
     try:
-        filepath = resolve_normalized_site_file(settings.sites_dir, subdomain, path)
+        response, status_code, bytes_sent, content_type = await run_in_threadpool(
+            build_static_response, request, subdomain, path, settings
+        )
     except InvalidSubdomain:
         return Response(content="Site not found", status_code=404, media_type="text/plain")
+    record_analytics(request, subdomain, path, status_code, bytes_sent, content_type, settings)
+    if private:
+        protect_response(response)
+    return response
+
+
+def build_static_response(
+    request: Request, subdomain: str, path: str, settings: Settings
+) -> tuple[Response, int, int, str]:
+    """Resolve and build the response for one hosted URL, returning it with the
+    status, body size, and content type the analytics event needs."""
+    resolution_cache: ResolutionCache = request.app.state.resolution_cache
+    filepath = resolution_cache.resolve(settings.sites_dir, subdomain, path)
 
     if filepath:
         content_type = CONTENT_TYPES.get(filepath.suffix.lower(), "application/octet-stream")
-        record_analytics(request, subdomain, path, 200, filepath.stat().st_size, content_type, settings)
-        response = FileResponse(filepath, media_type=content_type)
-        if private:
-            protect_response(response)
-        return response
-
-    site_dir = (settings.sites_dir / subdomain).resolve()
-    custom_404 = site_dir / "404.html"
-    if site_dir.is_dir() and custom_404.is_file():
-        record_analytics(request, subdomain, path, 404, custom_404.stat().st_size, "text/html", settings)
-        response = FileResponse(custom_404, status_code=404, media_type="text/html")
-        if private:
-            protect_response(response)
-        return response
+        # One stat serves analytics and the response alike; without the shared
+        # result FileResponse stats the file a second time on every request.
+        filepath, stat_result, encoding = negotiated_file(request, filepath)
+        etag = f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        if is_not_modified(request, etag, last_modified):
+            bytes_sent = 0
+            response = Response(
+                status_code=304,
+                headers={"ETag": etag, "Last-Modified": last_modified},
+            )
+            status_code = 304
+        else:
+            bytes_sent = stat_result.st_size
+            response = cached_file_response(
+                request, filepath, stat_result, content_type, etag, last_modified
+            )
+            status_code = 200
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+        return response, status_code, bytes_sent, content_type
+
+    custom_404 = (settings.sites_dir / subdomain).resolve() / "404.html"
+    # One stat replaces the is_dir/is_file/stat trio this branch used to make.
+    try:
+        stat_result = os.stat(custom_404)
+    except OSError:
+        stat_result = None
+    if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+        response = FileResponse(
+            custom_404, status_code=404, media_type="text/html", stat_result=stat_result
+        )
+        return response, 404, stat_result.st_size, "text/html"
 
     content = b"404 Not Found"
-    record_analytics(request, subdomain, path, 404, len(content), "text/plain", settings)
     response = Response(content=content, status_code=404, media_type="text/plain")
-    if private:
-        protect_response(response)
-    return response
+    return response, 404, len(content), "text/plain"
+
+
+def negotiated_file(
+    request: Request, filepath: Path
+) -> tuple[Path, os.stat_result, str | None]:
+    """Prefer a sibling <name>.gz when the client accepts gzip, nginx
+    gzip_static style: site builds that emit precompressed assets pay the
+    compression cost once instead of shipping full bodies on every request.
+    The original file keeps naming the content type either way."""
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        gz_path = filepath.with_name(filepath.name + ".gz")
+        try:
+            return gz_path, os.stat(gz_path), "gzip"
+        except OSError:
+            pass
+    return filepath, os.stat(filepath), None
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip, honoring q-values: `gzip;q=0` is
+    an explicit refusal, not an acceptance (RFC 9110 §12.5.3)."""
+    for member in accept_encoding.lower().split(","):
+        coding, _, params = member.partition(";")
+        if coding.strip() != "gzip":
+            continue
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value.strip()) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """Whether the client's cached copy is still good, per RFC 9110: a supplied
+    If-None-Match decides alone; If-Modified-Since only applies without one."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip(" W/") for tag in if_none_match.split(",")]
+    if_modified_since = parsedate(request.headers.get("if-modified-since", ""))
+    return if_modified_since is not None and if_modified_since >= parsedate(last_modified)
+
+
+def cached_file_response(
+    request: Request,
+    filepath: Path,
+    stat_result: os.stat_result,
+    content_type: str,
+    etag: str,
+    last_modified: str,
+) -> Response:
+    """Serve small assets from memory; stream everything else from disk."""
+    validators = {"ETag": etag, "Last-Modified": last_modified}
+    cache: SmallAssetCache = request.app.state.asset_cache
+    if not cache.cacheable(stat_result.st_size):
+        return FileResponse(
+            filepath,
+            media_type=content_type,
+            stat_result=stat_result,
+            headers=validators,
+        )
+
+    body = cache.get(filepath, stat_result.st_mtime_ns, stat_result.st_size)
+    if body is None:
+        body = filepath.read_bytes()
+        cache.put(filepath, stat_result.st_mtime_ns, stat_result.st_size, body)
+    return Response(content=body, media_type=content_type, headers=validators)
 
 
 def protect_response(response: Response) -> None:
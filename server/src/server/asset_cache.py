@@ -0,0 +1,56 @@
+"""Bounded in-memory cache of small site assets.
+
+A deployed site's working set is tiny (index.html, a stylesheet, a script,
+a favicon), so repeated GETs should not re-read the same few kilobytes from
+disk. Entries are keyed by (path, mtime_ns, size): deploys publish by
+renaming a staged directory, so a replaced file always shows up under a new
+key and stale bytes simply age out of the LRU. Like the visibility cache,
+this assumes a single server process.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+SMALL_ASSET_MAX_BYTES = 64 * 1024
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+_Key = tuple[str, int, int]
+
+
+class SmallAssetCache:
+    def __init__(
+        self,
+        max_entry_bytes: int = SMALL_ASSET_MAX_BYTES,
+        max_total_bytes: int = CACHE_MAX_BYTES,
+    ):
+        self._max_entry_bytes = max_entry_bytes
+        self._max_total_bytes = max_total_bytes
+        self._entries: OrderedDict[_Key, bytes] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def cacheable(self, size: int) -> bool:
+        return size <= self._max_entry_bytes
+
+    def get(self, path: Path, mtime_ns: int, size: int) -> bytes | None:
+        key = (str(path), mtime_ns, size)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, path: Path, mtime_ns: int, size: int, body: bytes) -> None:
+        if len(body) > self._max_entry_bytes:
+            return
+        key = (str(path), mtime_ns, size)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = body
+            self._total_bytes += len(body)
+            while self._total_bytes > self._max_total_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
@@ -2,14 +2,22 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import re
 import secrets
-from collections.abc import Callable
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 from .exceptions import Forbidden
 from .github_login import GitHubUser
 
+if TYPE_CHECKING:
+    import sqlite3
+
+    from .db import ReadConnection
+
 logger = logging.getLogger(__name__)
 
 SESSION_TOKEN_PREFIX = "buzz_sess_"
@@ -99,19 +107,57 @@ def _generate_deploy_token() -> str:
     return DEPLOY_TOKEN_PREFIX + secrets.token_urlsafe(32)
 
 
+_TOKEN_ID_PREFIX_RE = re.compile(r"^[0-9a-f]{16}$")
+
+
+def _prefix_range(prefix: str) -> tuple[str, str]:
+    """Half-open id range covering every hex token id starting with prefix.
+
+    `id >= lo AND id < hi` walks the primary-key index directly, where
+    `id LIKE 'prefix%'` scans the table. The prefix arrives from the request
+    path, and the API only ever hands out the first 16 hex characters of a
+    token id, so anything else — shorter, longer than a prefix should be, or
+    not lowercase hex — is rejected up front. Requiring the full prefix keeps
+    a single-character path segment from matching (and deleting) several
+    tokens at once, and rejecting non-hex keeps the bump of the final
+    character safely inside the hex range.
+    """
+    if not _TOKEN_ID_PREFIX_RE.match(prefix):
+        raise TokenNotFound()
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 class AuthService:
     def __init__(
         self,
         db: Callable,
         allow_registration: bool = True,
         allowed_github_users: frozenset[str] | None = None,
+        reader: ReadConnection | None = None,
     ) -> None:
         self._db = db
+        self._reader = reader
         self._allow_registration = allow_registration
         self._allowed_github_users = frozenset(
             login.lower() for login in (allowed_github_users or frozenset())
         )
 
+    @contextmanager
+    def _read(self) -> Generator[sqlite3.Connection, None, None]:
+        """Session checks run on every authenticated request, so they use the
+        shared long-lived connection when one is wired in, skipping the
+        per-call connect. Writes always go through connect-per-operation."""
+        if self._reader is not None:
+            with self._reader.borrow() as conn:
+                yield conn
+        else:
+            with self._db() as conn:
+                yield conn
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+
     def _ensure_allowed(self, login: str, *, is_new_user: bool, github_id: int | None = None) -> None:
         if self._allowed_github_users:
             if login.lower() not in self._allowed_github_users:
@@ -149,7 +195,7 @@ class AuthService:
 
     def user_is_allowed(self, user_id: int) -> bool:
         """Return whether a Principal is admitted to the control plane."""
-        with self._db() as conn:
+        with self._read() as conn:
             row = conn.execute(
                 "SELECT github_login, control_admitted FROM users WHERE id = ?",
                 (user_id,),
@@ -297,7 +343,7 @@ class AuthService:
         return token
 
     def _resolve_session(self, token_hash: str, now: str) -> Identity | None:
-        with self._db() as conn:
+        with self._read() as conn:
             row = conn.execute(
                 "SELECT s.user_id, u.github_login, u.github_name, u.control_admitted "
                 "FROM sessions s JOIN users u ON s.user_id = u.id "
@@ -317,6 +363,20 @@ class AuthService:
             session_id=token_hash,
         )
 
+    def purge_expired(self) -> None:
+        """Drop lapsed sessions and deployment tokens. Expired rows are inert —
+        every lookup rechecks expires_at — but they accumulate forever in the
+        tables the hottest queries probe. Called at startup, which bounds the
+        backlog to one process lifetime."""
+        now = datetime.now().isoformat()
+        with self._db() as conn:
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM deployment_tokens "
+                "WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+
     def logout(self, raw_token: str) -> None:
         token = raw_token.removeprefix("Bearer ")
         if not token or not token.startswith(SESSION_TOKEN_PREFIX):
@@ -325,75 +385,87 @@ class AuthService:
             conn.execute("DELETE FROM sessions WHERE id = ?", (_hash_token(token),))
 
     def create_deploy_token(self, user_id: int, site_name: str, name: str = "Deployment token") -> CreatedToken:
-        with self._db() as conn:
-            site = conn.execute("SELECT owner_id FROM sites WHERE name = ?", (site_name,)).fetchone()
-        if not site:
-            raise SiteNotFound()
-        if site["owner_id"] != user_id:
-            raise NotSiteOwner()
-
         token = _generate_deploy_token()
         token_hash = _hash_token(token)
+        # The ownership check rides inside the insert: the row is only written
+        # when the caller owns the site, in one statement on one connection.
         with self._db() as conn:
-            conn.execute(
-                "INSERT INTO deployment_tokens (id, name, site_name, user_id) VALUES (?, ?, ?, ?)",
-                (token_hash, name, site_name, user_id),
+            cursor = conn.execute(
+                "INSERT INTO deployment_tokens (id, name, site_name, user_id) "
+                "SELECT ?, ?, ?, ? "
+                "WHERE EXISTS (SELECT 1 FROM sites WHERE name = ? AND owner_id = ?)",
+                (token_hash, name, site_name, user_id, site_name, user_id),
             )
+            if cursor.rowcount == 0:
+                # Failure path only: work out which error to raise.
+                site = conn.execute(
+                    "SELECT 1 FROM sites WHERE name = ?", (site_name,)
+                ).fetchone()
+                if not site:
+                    raise SiteNotFound()
+                raise NotSiteOwner()
         return CreatedToken(id_prefix=token_hash[:16], raw_token=token, name=name, site_name=site_name)
 
     def list_deploy_tokens(self, user_id: int) -> list[DeployTokenInfo]:
         with self._db() as conn:
-            rows = conn.execute(
+            cursor = conn.execute(
                 "SELECT id, name, site_name, created_at, expires_at, last_used_at "
                 "FROM deployment_tokens WHERE user_id = ? ORDER BY created_at DESC",
                 (user_id,),
-            ).fetchall()
+            )
+            # The listing consumes every column positionally, so plain tuples
+            # skip building a name-indexed Row per token.
+            cursor.row_factory = None
+            rows = cursor.fetchall()
         return [
             DeployTokenInfo(
-                id_prefix=r["id"][:16],
-                name=r["name"],
-                site_name=r["site_name"],
-                created_at=r["created_at"],
-                expires_at=r["expires_at"],
-                last_used_at=r["last_used_at"],
+                id_prefix=token_id[:16],
+                name=name,
+                site_name=site_name,
+                created_at=created_at,
+                expires_at=expires_at,
+                last_used_at=last_used_at,
             )
-            for r in rows
+            for token_id, name, site_name, created_at, expires_at, last_used_at in rows
         ]
 
     def delete_deploy_token(self, user_id: int, token_id_prefix: str) -> None:
+        lo, hi = _prefix_range(token_id_prefix)
         with self._db() as conn:
-            row = conn.execute(
-                "SELECT id FROM deployment_tokens WHERE id LIKE ? AND user_id = ?",
-                (token_id_prefix + "%", user_id),
+            deleted = conn.execute(
+                "DELETE FROM deployment_tokens WHERE id >= ? AND id < ? AND user_id = ? "
+                "RETURNING id",
+                (lo, hi, user_id),
             ).fetchone()
-            if not row:
-                raise TokenNotFound()
-            conn.execute("DELETE FROM deployment_tokens WHERE id = ?", (row["id"],))
+        if not deleted:
+            raise TokenNotFound()
 
     def _resolve_deploy_token(self, token_hash: str, now: str) -> Identity | None:
         with self._db() as conn:
-            row = conn.execute(
-                "SELECT dt.user_id, dt.site_name, u.github_login, u.github_name, "
-                "u.control_admitted "
-                "FROM deployment_tokens dt JOIN users u ON dt.user_id = u.id "
-                "WHERE dt.id = ? AND (dt.expires_at IS NULL OR dt.expires_at > ?)",
-                (token_hash, now),
+            token = conn.execute(
+                "UPDATE deployment_tokens SET last_used_at = ? "
+                "WHERE id = ? AND (expires_at IS NULL OR expires_at > ?) "
+                "RETURNING user_id, site_name",
+                (now, token_hash, now),
             ).fetchone()
-            if not row:
+            if not token:
                 return None
-            if not self._control_allowed_row(row):
-                raise AccessDenied(row["github_login"])
-            conn.execute(
-                "UPDATE deployment_tokens SET last_used_at = ? WHERE id = ?",
-                (now, token_hash),
-            )
+            # RETURNING cannot join, but the follow-up is an integer PK probe
+            # and a denied user rolls back the last_used_at stamp with it.
+            user = conn.execute(
+                "SELECT github_login, github_name, control_admitted "
+                "FROM users WHERE id = ?",
+                (token["user_id"],),
+            ).fetchone()
+            if not self._control_allowed_row(user):
+                raise AccessDenied(user["github_login"])
         return Identity(
             user=User(
-                id=row["user_id"],
-                github_login=row["github_login"],
-                github_name=row["github_name"],
-                control_admitted=bool(row["control_admitted"]),
+                id=token["user_id"],
+                github_login=user["github_login"],
+                github_name=user["github_name"],
+                control_admitted=bool(user["control_admitted"]),
             ),
             token_type="deploy",
-            site_name=row["site_name"],
+            site_name=token["site_name"],
         )
@@ -84,8 +84,12 @@ def main() -> None:
             reload=True,
         )
     else:
+        # uvicorn[standard] picks uvloop and httptools on its own; the access
+        # log is per-request formatting overhead, so it stays a dev-mode tool
+        # (production traffic is visible through analytics and the proxy).
         uvicorn.run(
             create_app(settings, database),
             host=args.host,
             port=args.port,
+            access_log=settings.dev_mode,
         )
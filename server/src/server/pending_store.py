@@ -13,15 +13,28 @@ from typing import Any, Callable
 # flood of unauthenticated inserts cannot pin the event loop scanning the store.
 PURGE_INTERVAL_SECONDS = 1.0
 
+# Hard ceiling on live entries. Each store holds one flow type with a fixed
+# TTL, so insertion order is expiry order and the oldest entry is always the
+# right one to shed when an unauthenticated flood outruns the purge throttle.
+MAX_ENTRIES = 10_000
+
 
 class PendingStore:
-    def __init__(self, clock: Callable[[], float] = time.monotonic):
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        max_entries: int = MAX_ENTRIES,
+    ):
         self._clock = clock
+        self._max_entries = max_entries
         self._entries: dict[str, tuple[float, Any]] = {}
         self._last_purge = clock()
 
     def put(self, key: str, value: Any, ttl_seconds: float) -> None:
         self._purge_expired()
+        self._entries.pop(key, None)
+        while len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
         self._entries[key] = (self._clock() + ttl_seconds, value)
 
     def get(self, key: str) -> Any | None:
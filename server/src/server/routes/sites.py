@@ -16,7 +16,7 @@ from ..dependencies import (
     require_deploy_identity,
     require_user,
 )
-from ..exceptions import BadRequest, Forbidden, PayloadTooLarge
+from ..exceptions import BadRequest, Conflict, Forbidden, PayloadTooLarge
 from ..settings import Settings
 from ..site_path import InvalidSubdomain, validated_subdomain
 from ..site_store import DeploymentLimits, SiteRecord, SiteStore
@@ -32,6 +32,23 @@ def validate_subdomain(subdomain: str) -> str:
         raise BadRequest("Invalid site name")
 
 
+def generated_unclaimed_subdomain(database: Database) -> str:
+    """A generated name no site holds yet. Without the check, a collision either
+    fails the deploy with a Forbidden the user cannot act on or silently
+    replaces another site the same user owns. The name space is large, so a few
+    retries always suffice; if two deploys race onto the same fresh name,
+    SiteStore's ownership check still arbitrates."""
+    with database.connect() as conn:
+        for _ in range(16):
+            subdomain = generate_subdomain()
+            claimed = conn.execute(
+                "SELECT 1 FROM sites WHERE name = ?", (subdomain,)
+            ).fetchone()
+            if not claimed:
+                return subdomain
+    raise Conflict("Could not generate a free site name; pass one in X-Buzz-Site")
+
+
 def build_site_url(subdomain: str, domain: str | None, fallback_port: int) -> str:
     if domain:
         return f"https://{subdomain}.{domain}"
@@ -133,7 +150,11 @@ async def deploy(
             "X-Subdomain was replaced by X-Buzz-Site. Upgrade the Buzz CLI "
             "(npm i -g @infomiho/buzz-cli) or send X-Buzz-Site instead."
         )
-    subdomain = validate_subdomain(x_buzz_site) if x_buzz_site else generate_subdomain()
+    subdomain = (
+        validate_subdomain(x_buzz_site)
+        if x_buzz_site
+        else generated_unclaimed_subdomain(database)
+    )
     if not identity.can_deploy_to(subdomain):
         raise Forbidden(
             f"Deploy token is scoped to site '{identity.site_name}', cannot deploy to '{subdomain}'"
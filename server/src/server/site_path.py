@@ -1,4 +1,8 @@
+import os
 import re
+import stat
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from urllib.parse import unquote
 
@@ -24,7 +28,7 @@ def validated_subdomain(raw: str) -> str:
 
 
 def normalized_url_path(raw: str) -> str:
-    path = raw.split("?", 1)[0]
+    path = raw.partition("?")[0]
     if not path.startswith("/") or _INVALID_ESCAPE_RE.search(path):
         raise InvalidPath("Invalid URL path")
     if _ENCODED_SEPARATOR_RE.search(path):
@@ -75,3 +79,52 @@ def resolve_normalized_site_file(
         return spa
 
     return None
+
+
+# Bounds the memory a 404 crawl can pin: misses are cached alongside hits, so
+# the map would otherwise grow with every probed URL.
+_RESOLUTION_MAX_ENTRIES = 8192
+
+
+class ResolutionCache:
+    """Remembers resolution outcomes per (subdomain, url_path).
+
+    Resolving a request walks up to four candidate paths, each costing a
+    resolve() plus a stat; repeat requests for the same URL redo all of it.
+    A deploy publishes a new directory and renames it into place, and nothing
+    mutates a published tree, so the site root's (st_ino, st_mtime_ns) pair
+    identifies one immutable tree: outcomes recorded against it stay valid
+    until the pair changes, and entries from a replaced tree are ignored.
+    """
+
+    def __init__(self, max_entries: int = _RESOLUTION_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[tuple[int, int], Path | None]
+        ] = OrderedDict()
+
+    def resolve(self, sites_dir: Path, subdomain: str, url_path: str) -> Path | None:
+        subdomain = validated_subdomain(subdomain)
+        try:
+            root_stat = os.stat(sites_dir / subdomain)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(root_stat.st_mode):
+            return None
+
+        key = (subdomain, url_path)
+        generation = (root_stat.st_ino, root_stat.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        resolved = resolve_normalized_site_file(sites_dir, subdomain, url_path)
+        with self._lock:
+            self._entries[key] = (generation, resolved)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return resolved
@@ -101,15 +101,24 @@ class SiteStore:
         if not site_dir.exists():
             return []
 
+        # os.scandir hands back type and stat information with the directory
+        # listing itself, where rglob pays a fresh stat per entry.
         entries: list[FileEntry] = []
-        for item in site_dir.rglob("*"):
-            rel = item.relative_to(site_dir)
-            entries.append(FileEntry(
-                path=str(rel),
-                size_bytes=item.stat().st_size if item.is_file() else 0,
-                is_dir=item.is_dir(),
-                depth=len(rel.parts) - 1,
-            ))
+        pending: list[tuple[str, str, int]] = [(str(site_dir), "", 0)]
+        while pending:
+            directory, prefix, depth = pending.pop()
+            with os.scandir(directory) as items:
+                for item in items:
+                    rel = prefix + item.name
+                    is_dir = item.is_dir(follow_symlinks=False)
+                    entries.append(FileEntry(
+                        path=rel,
+                        size_bytes=0 if is_dir else item.stat(follow_symlinks=False).st_size,
+                        is_dir=is_dir,
+                        depth=depth,
+                    ))
+                    if is_dir:
+                        pending.append((item.path, rel + "/", depth + 1))
 
         directory_paths = {e.path for e in entries if e.is_dir}
 
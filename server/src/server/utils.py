@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import secrets
+from functools import lru_cache
 from urllib.parse import urlsplit
 
 
@@ -14,6 +15,11 @@ def generate_subdomain() -> str:
     return f"{secrets.choice(ADJECTIVES)}-{secrets.choice(NOUNS)}-{secrets.randbelow(9000) + 1000}"
 
 
+# Every request parses the Host header (and the configured domain) through
+# here, and the set of distinct values a deployment sees is tiny; memoizing
+# turns the urlsplit per call into a dict hit. Bounded, so junk Host headers
+# cannot grow it.
+@lru_cache(maxsize=1024)
 def _hostname(host: str | None) -> str:
     if not host:
         return ""
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from server.asset_cache import SmallAssetCache
+
+
+def test_returns_cached_bytes_for_a_matching_key():
+    cache = SmallAssetCache()
+    path = Path("/sites/demo/index.html")
+    cache.put(path, 1, 4, b"home")
+    assert cache.get(path, 1, 4) == b"home"
+
+
+def test_replaced_file_misses_under_its_new_key():
+    cache = SmallAssetCache()
+    path = Path("/sites/demo/index.html")
+    cache.put(path, 1, 4, b"home")
+    assert cache.get(path, 2, 5) is None
+
+
+def test_oversized_assets_are_never_cached():
+    cache = SmallAssetCache(max_entry_bytes=4)
+    path = Path("/sites/demo/app.js")
+    assert not cache.cacheable(5)
+    cache.put(path, 1, 5, b"12345")
+    assert cache.get(path, 1, 5) is None
+
+
+def test_evicts_least_recently_used_entries_over_budget():
+    cache = SmallAssetCache(max_entry_bytes=4, max_total_bytes=8)
+    cache.put(Path("/a"), 1, 4, b"aaaa")
+    cache.put(Path("/b"), 1, 4, b"bbbb")
+    assert cache.get(Path("/a"), 1, 4) == b"aaaa"
+    cache.put(Path("/c"), 1, 4, b"cccc")
+    assert cache.get(Path("/b"), 1, 4) is None
+    assert cache.get(Path("/a"), 1, 4) == b"aaaa"
+    assert cache.get(Path("/c"), 1, 4) == b"cccc"
@@ -61,6 +61,24 @@ class TestAuthenticate:
         assert identity.token_type == "session"
         assert identity.site_name is None
 
+    def test_session_resolution_uses_the_shared_reader(self, database):
+        token = "buzz_sess_" + secrets.token_urlsafe(32)
+        with database.connect() as conn:
+            user_id = _insert_user(conn)
+            _insert_session(conn, token, user_id, datetime.now() + timedelta(days=30))
+
+        auth = AuthService(db=database.connect, reader=database.reader())
+        try:
+            identity = auth.authenticate(f"Bearer {token}")
+            assert identity is not None
+            assert identity.user.id == user_id
+
+            # The long-lived connection must observe later revocations.
+            auth.logout(f"Bearer {token}")
+            assert auth.authenticate(f"Bearer {token}") is None
+        finally:
+            auth.close()
+
     def test_expired_session_returns_none(self, database):
         token = "buzz_sess_" + secrets.token_urlsafe(32)
         with database.connect() as conn:
@@ -312,6 +330,45 @@ class TestDeployTokenCrud:
         with pytest.raises(TokenNotFound):
             auth.delete_deploy_token(user_id, "nonexistent")
 
+    def test_delete_empty_prefix_not_found(self, database):
+        with database.connect() as conn:
+            user_id = _insert_user(conn)
+            _insert_site(conn, "my-site", user_id)
+
+        auth = AuthService(db=database.connect)
+        auth.create_deploy_token(user_id, "my-site")
+
+        with pytest.raises(TokenNotFound):
+            auth.delete_deploy_token(user_id, "")
+        assert len(auth.list_deploy_tokens(user_id)) == 1
+
+    def test_delete_short_prefix_deletes_nothing(self, database):
+        with database.connect() as conn:
+            user_id = _insert_user(conn)
+            _insert_site(conn, "my-site", user_id)
+
+        auth = AuthService(db=database.connect)
+        for _ in range(8):
+            auth.create_deploy_token(user_id, "my-site")
+        first_char = auth.list_deploy_tokens(user_id)[0].id_prefix[0]
+
+        with pytest.raises(TokenNotFound):
+            auth.delete_deploy_token(user_id, first_char)
+        assert len(auth.list_deploy_tokens(user_id)) == 8
+
+    @pytest.mark.parametrize("prefix", ["%", "_", "ABC", "\U0010ffff"])
+    def test_delete_rejects_non_hex_prefixes(self, database, prefix):
+        with database.connect() as conn:
+            user_id = _insert_user(conn)
+            _insert_site(conn, "my-site", user_id)
+
+        auth = AuthService(db=database.connect)
+        auth.create_deploy_token(user_id, "my-site")
+
+        with pytest.raises(TokenNotFound):
+            auth.delete_deploy_token(user_id, prefix)
+        assert len(auth.list_deploy_tokens(user_id)) == 1
+
     def test_created_token_authenticates(self, database):
         with database.connect() as conn:
             user_id = _insert_user(conn)
@@ -448,3 +505,25 @@ class TestAccessControl:
                 "SELECT last_used_at FROM deployment_tokens WHERE id = ?", (_hash(token),)
             ).fetchone()
         assert row["last_used_at"] is None
+
+
+class TestPurgeExpired:
+    def test_removes_only_lapsed_credentials(self, database):
+        with database.connect() as conn:
+            user_id = _insert_user(conn)
+            _insert_site(conn, "my-site", user_id)
+            _insert_session(conn, "live", user_id, datetime.now() + timedelta(days=1))
+            _insert_session(conn, "dead", user_id, datetime.now() - timedelta(days=1))
+            _insert_deploy_token(conn, "keep", user_id, "my-site")
+            _insert_deploy_token(
+                conn, "gone", user_id, "my-site",
+                expires_at=datetime.now() - timedelta(days=1),
+            )
+
+        AuthService(db=database.connect).purge_expired()
+
+        with database.connect() as conn:
+            sessions = {r["id"] for r in conn.execute("SELECT id FROM sessions")}
+            tokens = {r["id"] for r in conn.execute("SELECT id FROM deployment_tokens")}
+        assert sessions == {_hash("live")}
+        assert tokens == {_hash("keep")}
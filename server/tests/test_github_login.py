@@ -1,8 +1,7 @@
 import asyncio
-import io
-from urllib.error import URLError
 from urllib.parse import parse_qs, urlsplit
 
+import httpx
 import pytest
 from httpx_oauth.exceptions import GetProfileError
 from httpx_oauth.oauth2 import GetAccessTokenError
@@ -250,19 +249,21 @@ class TestGitHubOAuth:
 
 
 class TestUserLookup:
-    def test_transport_failure_is_normalized(self, monkeypatch):
-        def fail(*_args, **_kwargs):
-            raise URLError("offline")
+    def test_transport_failure_is_normalized(self):
+        def offline(request):
+            raise httpx.ConnectError("offline")
 
-        monkeypatch.setattr("server.github.urlopen", fail)
+        client = HttpGitHubClient(transport=httpx.MockTransport(offline))
 
         with pytest.raises(GitHubLookupFailed):
-            HttpGitHubClient().get_user_by_login("alice")
+            client.get_user_by_login("alice")
 
-    def test_invalid_json_is_normalized(self, monkeypatch):
-        monkeypatch.setattr(
-            "server.github.urlopen", lambda *_args, **_kwargs: io.BytesIO(b"not-json")
+    def test_invalid_json_is_normalized(self):
+        client = HttpGitHubClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=b"not-json")
+            )
         )
 
         with pytest.raises(GitHubLookupFailed):
-            HttpGitHubClient().get_user_by_login("alice")
+            client.get_user_by_login("alice")
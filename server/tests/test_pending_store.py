@@ -61,3 +61,24 @@ def test_values_are_shared_by_reference():
     store.put("b", entry, ttl_seconds=60)
     store.get("a")["user_id"] = 7
     assert store.get("b")["user_id"] == 7
+
+
+def test_oldest_entry_is_dropped_at_the_size_ceiling():
+    clock = FakeClock()
+    store = PendingStore(clock=clock, max_entries=2)
+    store.put("first", 1, ttl_seconds=60)
+    store.put("second", 2, ttl_seconds=60)
+    store.put("third", 3, ttl_seconds=60)
+    assert store.get("first") is None
+    assert store.get("second") == 2
+    assert store.get("third") == 3
+
+
+def test_refreshing_a_key_does_not_count_against_the_ceiling():
+    clock = FakeClock()
+    store = PendingStore(clock=clock, max_entries=2)
+    store.put("a", 1, ttl_seconds=60)
+    store.put("b", 2, ttl_seconds=60)
+    store.put("b", 3, ttl_seconds=60)
+    assert store.get("a") == 1
+    assert store.get("b") == 3
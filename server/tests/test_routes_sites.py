@@ -88,6 +88,29 @@ def test_deploy_passes_requested_visibility(make_app, monkeypatch, header, expec
     assert (captured["configure"] is not None) is expected
 
 
+def test_generated_name_skips_claimed_sites(make_app, database, monkeypatch):
+    names = iter(["taken-site-1234", "free-site-5678"])
+    monkeypatch.setattr("server.routes.sites.generate_subdomain", lambda: next(names))
+    monkeypatch.setattr(
+        "server.routes.sites._deploy_site",
+        lambda database, settings, subdomain, archive, owner_id, configure: SiteRecord(
+            subdomain, owner_id, 0, "2026-07-16T00:00:00Z"
+        ),
+    )
+    with database.connect() as conn:
+        conn.execute(
+            "INSERT INTO sites (name, size_bytes) VALUES ('taken-site-1234', 1)"
+        )
+    client = TestClient(make_app(dev_mode=True))
+
+    response = client.post(
+        "/deploy", files={"file": ("site.zip", b"zip", "application/zip")}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "free-site-5678"
+
+
 def test_deploy_rejects_an_unknown_access_header(make_app):
     client = TestClient(make_app(dev_mode=True))
 
@@ -0,0 +1,117 @@
+import gzip
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+SITE_HOST = {"host": "demo.localhost:8080"}
+
+
+def _create_site(database, tmp_path, name: str = "demo") -> None:
+    with database.connect() as conn:
+        cursor = conn.execute(
+            "INSERT INTO users (github_id, github_login) VALUES (1, 'owner')"
+        )
+        conn.execute(
+            "INSERT INTO sites (name, owner_id, size_bytes) VALUES (?, ?, 1)",
+            (name, cursor.lastrowid),
+        )
+    site_dir = tmp_path / name
+    site_dir.mkdir()
+    (site_dir / "index.html").write_text("hello")
+
+
+def test_responses_carry_cache_validators(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    client = TestClient(make_app())
+
+    response = client.get("/", headers=SITE_HOST)
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"].endswith("GMT")
+
+
+def test_matching_etag_returns_304_without_a_body(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    client = TestClient(make_app())
+    etag = client.get("/", headers=SITE_HOST).headers["etag"]
+
+    response = client.get("/", headers={**SITE_HOST, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_stale_etag_returns_the_full_body(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    client = TestClient(make_app())
+
+    response = client.get("/", headers={**SITE_HOST, "If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.text == "hello"
+
+
+def test_if_modified_since_returns_304_for_a_fresh_copy(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    client = TestClient(make_app())
+    last_modified = client.get("/", headers=SITE_HOST).headers["last-modified"]
+
+    response = client.get("/", headers={**SITE_HOST, "If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
+
+
+def test_precompressed_sibling_is_served_to_gzip_clients(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    (tmp_path / "demo" / "index.html.gz").write_bytes(gzip.compress(b"hello, zipped"))
+    client = TestClient(make_app())
+
+    response = client.get("/", headers={**SITE_HOST, "Accept-Encoding": "gzip"})
+
+    assert response.text == "hello, zipped"
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0", "br;q=1, gzip;q=0"])
+def test_clients_refusing_gzip_get_the_original_file(make_app, database, tmp_path, accept_encoding):
+    _create_site(database, tmp_path)
+    (tmp_path / "demo" / "index.html.gz").write_bytes(gzip.compress(b"hello, zipped"))
+    client = TestClient(make_app())
+
+    response = client.get("/", headers={**SITE_HOST, "Accept-Encoding": accept_encoding})
+
+    assert response.text == "hello"
+    assert "content-encoding" not in response.headers
+
+
+def test_gzip_with_a_positive_q_value_is_accepted(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    (tmp_path / "demo" / "index.html.gz").write_bytes(gzip.compress(b"hello, zipped"))
+    client = TestClient(make_app())
+
+    response = client.get("/", headers={**SITE_HOST, "Accept-Encoding": "gzip;q=0.5"})
+
+    assert response.text == "hello, zipped"
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_if_none_match_takes_precedence_over_dates(make_app, database, tmp_path):
+    _create_site(database, tmp_path)
+    client = TestClient(make_app())
+    last_modified = client.get("/", headers=SITE_HOST).headers["last-modified"]
+
+    response = client.get(
+        "/",
+        headers={
+            **SITE_HOST,
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": last_modified,
+        },
+    )
+
+    assert response.status_code == 200
@@ -3,6 +3,7 @@ import pytest
 from server.site_path import (
     InvalidPath,
     InvalidSubdomain,
+    ResolutionCache,
     normalized_url_path,
     resolve_normalized_site_file,
     validated_subdomain,
@@ -186,3 +187,66 @@ class TestResolveSiteFile:
     def test_invalid_subdomain_raises(self, tmp_path):
         with pytest.raises(InvalidSubdomain):
             resolve_site_file(tmp_path, "../../etc", "/passwd")
+
+
+class TestResolutionCache:
+    def test_repeat_lookup_skips_the_resolver(self, tmp_path, monkeypatch):
+        site = tmp_path / "my-site"
+        site.mkdir()
+        (site / "index.html").write_text("hi")
+        cache = ResolutionCache()
+
+        first = cache.resolve(tmp_path, "my-site", "/")
+        monkeypatch.setattr(
+            "server.site_path.resolve_normalized_site_file",
+            lambda *args: pytest.fail("cached lookup should not re-resolve"),
+        )
+        assert cache.resolve(tmp_path, "my-site", "/") == first
+
+    def test_misses_are_cached(self, tmp_path, monkeypatch):
+        site = tmp_path / "my-site"
+        site.mkdir()
+        cache = ResolutionCache()
+
+        assert cache.resolve(tmp_path, "my-site", "/nope") is None
+        monkeypatch.setattr(
+            "server.site_path.resolve_normalized_site_file",
+            lambda *args: pytest.fail("cached miss should not re-resolve"),
+        )
+        assert cache.resolve(tmp_path, "my-site", "/nope") is None
+
+    def test_replaced_site_directory_invalidates(self, tmp_path):
+        site = tmp_path / "my-site"
+        site.mkdir()
+        cache = ResolutionCache()
+        assert cache.resolve(tmp_path, "my-site", "/") is None
+
+        staged = tmp_path / "staged"
+        staged.mkdir()
+        (staged / "index.html").write_text("hi")
+        site.rmdir()
+        staged.rename(site)
+
+        assert cache.resolve(tmp_path, "my-site", "/") == (site / "index.html").resolve()
+
+    def test_missing_site_returns_none_without_caching(self, tmp_path):
+        cache = ResolutionCache()
+        assert cache.resolve(tmp_path, "ghost", "/") is None
+        assert cache._entries == {}
+
+    def test_oldest_entry_is_evicted_at_the_ceiling(self, tmp_path):
+        site = tmp_path / "my-site"
+        site.mkdir()
+        (site / "a.html").write_text("a")
+        cache = ResolutionCache(max_entries=2)
+
+        cache.resolve(tmp_path, "my-site", "/a.html")
+        cache.resolve(tmp_path, "my-site", "/b")
+        cache.resolve(tmp_path, "my-site", "/c")
+
+        assert ("my-site", "/a.html") not in cache._entries
+        assert len(cache._entries) == 2
+
+    def test_invalid_subdomain_raises(self, tmp_path):
+        with pytest.raises(InvalidSubdomain):
+            ResolutionCache().resolve(tmp_path, "../../etc", "/passwd")